@@ -0,0 +1,85 @@
+import pytest
+
+from tinygpusim.cpu.command_generator import CommandType
+from tinygpusim.gpu.computation_entities import Kernel
+from tinygpusim.gpu.controlling.async_compute_engine import AsyncComputeEngine
+from tinygpusim.gpu.controlling.command_processor import CommandProcessor
+from tinygpusim.gpu.controlling.direct_mem_access import DMAEngine
+
+
+def make_processor(dma_count=1, ace_count=1):
+    return CommandProcessor(
+        [DMAEngine(i, dram=None, cpu=None) for i in range(dma_count)],
+        [AsyncComputeEngine(i) for i in range(ace_count)],
+    )
+
+
+def test_dispatches_by_command_type():
+    processor = make_processor()
+    copy = Kernel(name="copy", args={}, type=CommandType.MEMORY_COPY)
+    launch = Kernel(name="launch", args={}, type=CommandType.KERNEL_LAUNCH)
+
+    processor.process_command(copy)
+    processor.process_command(launch)
+
+    assert processor.dma_engines[0].kernel is copy
+    assert processor.async_compute_engines[0].kernel is launch
+
+
+@pytest.mark.parametrize("command_type", [2, -1, True, "memory_copy", 1.0])
+def test_rejects_unknown_command_types(command_type):
+    processor = make_processor()
+    with pytest.raises(ValueError):
+        processor.process_command(Kernel(name="k", args={}, type=command_type))
+    assert processor.dma_engines[0].kernel is None
+    assert processor.async_compute_engines[0].kernel is None
+
+
+def test_engine_lists_are_indexed_by_id():
+    processor = CommandProcessor(
+        [DMAEngine(i, dram=None, cpu=None) for i in (1, 0)],
+        [AsyncComputeEngine(i) for i in (2, 0, 1)],
+    )
+    assert [engine.id for engine in processor.dma_engines] == [0, 1]
+    assert [engine.id for engine in processor.async_compute_engines] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("ids", [(0, 0), (0, 2), (1,)])
+def test_rejects_engine_ids_outside_range(ids):
+    with pytest.raises(ValueError):
+        CommandProcessor([DMAEngine(i, dram=None, cpu=None) for i in ids], [])
+    with pytest.raises(ValueError):
+        CommandProcessor([], [AsyncComputeEngine(i) for i in ids])
+
+
+def test_busy_engines_leave_the_queue_and_requeue_once_on_finish():
+    processor = make_processor(dma_count=2, ace_count=2)
+    dma, ace = processor.dma_engines[0], processor.async_compute_engines[0]
+
+    processor.process_command(Kernel("copy", {}, CommandType.MEMORY_COPY))
+    processor.process_command(Kernel("launch", {}, CommandType.KERNEL_LAUNCH))
+    assert not dma.available and not ace.available
+    assert list(processor.available_dma) == [1]
+    assert list(processor.available_ace) == [1]
+
+    dma.finish_kernel()
+    ace.finish_kernel()
+    assert dma.available and ace.available
+    assert list(processor.available_dma) == [1, 0]
+    assert list(processor.available_ace) == [1, 0]
+
+
+def test_repeated_update_available_does_not_duplicate():
+    processor = make_processor(dma_count=2, ace_count=2)
+    dma, ace = processor.dma_engines[0], processor.async_compute_engines[0]
+    processor.process_command(Kernel("copy", {}, CommandType.MEMORY_COPY))
+    processor.process_command(Kernel("launch", {}, CommandType.KERNEL_LAUNCH))
+    dma.finish_kernel()
+    ace.finish_kernel()
+
+    for engine in (dma, ace):
+        engine.update_available()
+        engine.update_available()
+
+    assert list(processor.available_dma) == [1, 0]
+    assert list(processor.available_ace) == [1, 0]
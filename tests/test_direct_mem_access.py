@@ -0,0 +1,34 @@
+import pytest
+
+from tinygpusim.cpu.cpu_mem import CPUMemory
+from tinygpusim.gpu.controlling.direct_mem_access import DMAEngine
+from tinygpusim.gpu.mem.dram import DRAMController
+
+
+def make_engine(burst_size=16):
+    cpu = CPUMemory(256)
+    cpu.write(0, bytes(range(100)))
+    return DMAEngine(0, DRAMController(capacity=256), cpu, burst_size), cpu
+
+
+def test_copy_spans_several_bursts():
+    engine, _ = make_engine(burst_size=16)
+    engine.copy_from_cpu_to_dram(src_addr=10, dst_addr=50, size=70)
+
+    assert bytes(engine.dram.load(50, 70)) == bytes(range(10, 80))
+    assert bytes(engine.dram.load(0, 50)) == bytes(50)
+    assert bytes(engine.dram.load(120, 136)) == bytes(136)
+
+
+@pytest.mark.parametrize("dst_addr", [-1, 200])
+def test_out_of_range_destination_writes_nothing(dst_addr):
+    engine, _ = make_engine()
+    with pytest.raises(ValueError):
+        engine.copy_from_cpu_to_dram(src_addr=0, dst_addr=dst_addr, size=64)
+    assert bytes(engine.dram.load(0, 256)) == bytes(256)
+
+
+@pytest.mark.parametrize("burst_size", [0, -16])
+def test_rejects_non_positive_burst_size(burst_size):
+    with pytest.raises(ValueError):
+        DMAEngine(0, DRAMController(capacity=256), CPUMemory(256), burst_size)
@@ -0,0 +1,16 @@
+import pytest
+
+from tinygpusim.gpu.mem.dram import DRAMController
+
+
+@pytest.mark.parametrize("capacity", [0, -1])
+def test_rejects_non_positive_capacity(capacity):
+    with pytest.raises(ValueError):
+        DRAMController(capacity=capacity)
+
+
+def test_store_then_load_round_trips():
+    dram = DRAMController(capacity=1024)
+    dram.store(1000, b"tail")
+    assert bytes(dram.load(1000, 4)) == b"tail"
+    assert bytes(dram.load(0, 4)) == bytes(4)
@@ -0,0 +1,28 @@
+import pytest
+
+from tinygpusim.gpu.mem.l1cache import L1Cache
+
+
+def test_hit_miss_and_lru_eviction_order():
+    # 512 B, 64 B lines, 2 ways -> 4 sets; addresses 256 B apart share set 0
+    cache = L1Cache(size=512, line_size=64, ways=2)
+    stride = 256
+    accesses = [0, 0, stride, 0, 2 * stride, stride, 0]
+
+    hits = [cache.access(address, is_write=False) for address in accesses]
+
+    # 2*stride evicts stride (LRU); reloading stride then evicts 0
+    assert hits == [False, True, False, True, False, False, False]
+
+
+def test_same_line_hits():
+    cache = L1Cache()
+    assert not cache.access(128, is_write=True)
+    assert cache.access(128 + 63, is_write=False)
+    assert not cache.access(128 + 64, is_write=False)
+
+
+@pytest.mark.parametrize("kwargs", [{"line_size": 48}, {"size": 3 * 64 * 4}])
+def test_rejects_non_power_of_two_geometry(kwargs):
+    with pytest.raises(ValueError):
+        L1Cache(**kwargs)
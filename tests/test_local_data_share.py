@@ -0,0 +1,28 @@
+import pytest
+
+from tinygpusim.gpu.shader.local_data_share import LDS_SIZE, LocalDataShare
+from tinygpusim.gpu.shader.shader_engine import ShaderArray
+
+
+def test_size_must_match_storage():
+    assert LocalDataShare().size == LDS_SIZE
+    assert LocalDataShare(size=128).size == 128
+    assert LocalDataShare(memoryview(bytearray(64)), size=64).size == 64
+    with pytest.raises(ValueError):
+        LocalDataShare(memoryview(bytearray(64)), size=128)
+
+
+def test_pool_slices_are_disjoint_views_of_one_buffer():
+    arrays = ShaderArray.create_pool(num_arrays=3, cu_count=2, lds_bytes=32)
+    shares = [array.compute_units[0].local_data_share for array in arrays]
+
+    # One LDS per array, shared by all of its CUs
+    for array, lds in zip(arrays, shares):
+        assert all(cu.local_data_share is lds for cu in array.compute_units)
+    assert [lds.size for lds in shares] == [32, 32, 32]
+
+    pool = shares[0].storage.obj
+    assert all(lds.storage.obj is pool for lds in shares)
+    for index, lds in enumerate(shares):
+        lds.storage[:] = bytes([index + 1]) * 32
+    assert bytes(pool) == b"\x01" * 32 + b"\x02" * 32 + b"\x03" * 32
@@ -0,0 +1,49 @@
+import pytest
+
+from tinygpusim.interconnect.pcie import PCIe
+
+
+def test_transfers_queue_on_the_link_and_retire_in_order():
+    link = PCIe()  # 16 bytes per cycle
+
+    assert link.transfer(None, dst_addr=0, size=100) == 7
+    assert link.transfer(None, dst_addr=1, size=33, now=2) == 10
+    assert link.transfer(None, dst_addr=2, size=16, now=50) == 51
+
+    assert link.retire(6) == []
+    assert link.retire(9) == [(7, 0, 100)]
+    assert link.retire(51) == [(10, 1, 33), (51, 2, 16)]
+    assert link.retire(100) == []
+
+
+@pytest.mark.parametrize("now", [0, 3, 40])
+def test_transfer_batch_matches_repeated_transfers(now):
+    sizes, dst_addrs = [100, 33, 16, 1], [0, 64, 128, 192]
+    single, batched = PCIe(), PCIe()
+    single.transfer(None, dst_addr=9, size=50)
+    batched.transfer(None, dst_addr=9, size=50)
+
+    expected = [
+        single.transfer(None, dst_addr, size, now)
+        for size, dst_addr in zip(sizes, dst_addrs)
+    ]
+
+    assert batched.transfer_batch(sizes, dst_addrs, now) == expected
+    assert batched.busy_until == single.busy_until
+    assert batched.inflight == single.inflight
+
+
+def test_transfer_batch_accepts_generators():
+    link = PCIe()
+    finish = link.transfer_batch((size for size in [100, 33]), iter([0, 1]))
+
+    assert finish == [7, 10]
+    assert list(link.inflight) == [(7, 0, 100), (10, 1, 33)]
+
+
+def test_transfer_batch_rejects_mismatched_lengths():
+    link = PCIe()
+    with pytest.raises(ValueError):
+        link.transfer_batch([16, 16], [0])
+    assert link.busy_until == 0
+    assert not link.inflight
@@ -0,0 +1,65 @@
+import pytest
+
+from tinygpusim.gpu.computation_entities import Kernel, Wavefront, Workgroup
+from tinygpusim.gpu.shader.shader_engine import (
+    WAVEFRONT_WIDTH,
+    ComputeUnit,
+    ShaderArray,
+    ShaderEngine,
+)
+
+
+def make_engine(cu_count=2):
+    engine = ShaderEngine([ShaderArray(cu_count)])
+    workgroup = Workgroup(kernel=Kernel(name="k", args={}))
+    return engine, workgroup
+
+
+def make_wavefronts(workgroup, count):
+    return [Wavefront(kernel=workgroup.kernel, workgroup=workgroup) for _ in range(count)]
+
+
+def test_heap_stays_bounded_under_churn():
+    engine, workgroup = make_engine(cu_count=8)
+    for _ in range(10_000):
+        cu = engine.least_loaded_compute_unit(4)
+        wavefronts = make_wavefronts(workgroup, 4)
+        engine.allocate_wavefronts(cu, wavefronts)
+        for wavefront in wavefronts:
+            engine.retire_wavefront(cu, wavefront)
+    assert len(engine.cu_heap) <= 2 * len(engine.cu_flat)
+
+
+def test_full_cu_is_skipped():
+    engine, workgroup = make_engine()
+    cu0, cu1 = engine.cu_flat
+    engine.allocate_wavefronts(cu0, make_wavefronts(workgroup, 40))
+
+    assert engine.least_loaded_compute_unit(4) is cu1
+
+
+def test_least_loaded_returns_none_when_all_full():
+    engine, workgroup = make_engine()
+    for cu in engine.cu_flat:
+        engine.allocate_wavefronts(cu, make_wavefronts(workgroup, 38))
+
+    assert engine.least_loaded_compute_unit(4) is None
+    assert engine.least_loaded_compute_unit(2) is not None
+
+
+def test_rejects_compute_units_with_different_slot_counts():
+    small = ShaderArray(1)
+    small.compute_units = (ComputeUnit(small.compute_units[0].local_data_share, 20),)
+    with pytest.raises(ValueError):
+        ShaderEngine([ShaderArray(1), small])
+
+
+def test_wavefront_vgprs_are_disjoint_slices_of_the_cu_file():
+    cu = ShaderArray(1).compute_units[0]
+    first, second = cu.wavefront_vgprs(0), cu.wavefront_vgprs(1)
+    first[-1] = 1
+    second[0] = 2
+
+    span = cu.vgprs_per_wavefront * WAVEFRONT_WIDTH
+    assert len(first) == len(second) == span
+    assert cu.vector_registers[span - 1 : span + 1].tolist() == [1, 2]
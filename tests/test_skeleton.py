@@ -0,0 +1,9 @@
+import pytest
+
+from tinygpusim.skeleton import run_gpu_simulation
+
+
+@pytest.mark.parametrize("count, cycles", [(0, 0), (1, 5), (4, 8)])
+def test_cycle_count(count, cycles):
+    instructions = [f"ADD R{i}, R{i}, R{i}" for i in range(count)]
+    assert run_gpu_simulation(instructions) == cycles
@@ -1,7 +1,41 @@
+from array import array
 from dataclasses import dataclass
+from enum import IntEnum
+from typing import Iterator, NamedTuple
+
+
+class CommandType(IntEnum):
+    """Command kinds; values double as indices into dispatch tables."""
+
+    MEMORY_COPY = 0
+    KERNEL_LAUNCH = 1
+
+
+class Command(NamedTuple):
+    type: CommandType
+    param1: int
+    param2: int
 
 
 @dataclass
-class Command:
-    type: str
-    parameters: dict[str, int]
+class CommandBatch:
+    """
+    Struct-of-arrays form of a sequence of commands.
+
+    The i-th command is (types[i], param1[i], param2[i]). Parameters are
+    kept in typed int64 arrays so no per-command dict is allocated.
+    """
+
+    types: list[CommandType]
+    param1: array
+    param2: array
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[Command]:
+        return map(Command, self.types, self.param1, self.param2)
+
+    def as_list(self) -> list[Command]:
+        """Materialize the batch as Command objects for callers that need them."""
+        return list(map(Command, self.types, self.param1, self.param2))
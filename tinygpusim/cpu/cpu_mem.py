@@ -11,14 +11,19 @@ class CPUMemory:
         """
         self.size = size
         self.memory = bytearray(size)
+        # Fixed-size buffer, so a single exported view stays valid.
+        self._view = memoryview(self.memory)
 
     def read(self, address, size):
         """
         Reads data from the CPU memory.
+
+        Returns a zero-copy memoryview; call bytes() on it if a snapshot
+        is needed.
         """
         if address < 0 or address + size > self.size:
             raise IndexError("Invalid memory access")
-        return self.memory[address : address + size]
+        return self._view[address : address + size]
 
     def write(self, address, data):
         """
@@ -1,21 +1,25 @@
+from array import array
+
 from .cpu_mem import CPUMemory
-from .command_generator import Command
+from .command_generator import CommandBatch, CommandType
 
 
 class CPU:
     def __init__(self, cpu: CPUMemory):
         self.cpu_mem = cpu
 
-    def generate_commands(self, num_commands: int):
+    def generate_commands(self, num_commands: int) -> CommandBatch:
         if num_commands < 0:
             raise ValueError("Number of commands must be non-negative")
 
-        commands = []
-        for i in range(num_commands):
-            command = Command(
-                type="kernel_launch" if i % 2 == 0 else "memory_copy",
-                parameters={"param1": i, "param2": i * 2},
-            )
-            commands.append(command)
+        # Even slots launch kernels, odd slots copy memory.
+        types = [CommandType.KERNEL_LAUNCH, CommandType.MEMORY_COPY] * (
+            (num_commands + 1) // 2
+        )
+        del types[num_commands:]
 
-        return commands
+        return CommandBatch(
+            types=types,
+            param1=array("q", range(num_commands)),
+            param2=array("q", range(0, 2 * num_commands, 2)),
+        )
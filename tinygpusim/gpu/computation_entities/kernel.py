@@ -1,18 +1,21 @@
 from dataclasses import dataclass
 
+from ...cpu.command_generator import CommandType
 
-@dataclass
+
+@dataclass(slots=True, eq=False)
 class Wavefront:
     kernel: "Kernel"
     workgroup: "Workgroup"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Workgroup:
     kernel: "Kernel"
 
 
-@dataclass
+@dataclass(slots=True)
 class Kernel:
     name: str
-    args: dict
\ No newline at end of file
+    args: dict
+    type: CommandType = CommandType.KERNEL_LAUNCH
@@ -1,5 +1,5 @@
 from ..computation_entities import Kernel, Workgroup
-from typing import List, Optional
+from typing import Callable, List, Optional
 from ..shader import ShaderPipeInput
 from collections import deque
 
@@ -15,12 +15,23 @@ class AsyncComputeEngine:
         active_tasks: Currently executing tasks
         workgroup_queue: Queue of workgroups
         is_workgroup_queue_empty: Flag to indicate if the workgroup queue is empty
+        on_available: Called with the engine id when it becomes available
     """
 
+    __slots__ = (
+        "id",
+        "kernel",
+        "_available",
+        "on_available",
+        "workgroup_queue",
+        "workgroup_queue_state",
+    )
+
     def __init__(self, id: int):
         self.id = id
         self.kernel: Optional[Kernel] = None
         self._available = True
+        self.on_available: Optional[Callable[[int], None]] = None
         self.workgroup_queue: deque[Workgroup] = deque()
         self.workgroup_queue_state = "empty"
 
@@ -37,12 +48,8 @@ class AsyncComputeEngine:
         self.update_state()
 
     def update_state(self):
-        if self.kernel is not None:
-            self.update_available()
-            self.update_workgroup_queue_state()
-        else:
-            self.update_available()
-            self.update_workgroup_queue_state()
+        self.update_available()
+        self.update_workgroup_queue_state()
 
     def update_workgroup_queue_state(self):
         if len(self.workgroup_queue) == 0:
@@ -71,7 +78,7 @@ class AsyncComputeEngine:
 
     def update_available(self):
         """Update the availability of the compute unit"""
-        if self.kernel is None:
-            self._available = True
-        else:
-            self._available = False
+        was_available = self._available
+        self._available = self.kernel is None
+        if self._available and not was_available and self.on_available is not None:
+            self.on_available(self.id)
@@ -1,10 +1,29 @@
 from .direct_mem_access import DMAEngine
 from .async_compute_engine import AsyncComputeEngine
 from ..computation_entities import Kernel
-from typing import List
+from ...cpu.command_generator import CommandType
+from typing import List, TypeVar
 
 from collections import deque
 
+Engine = TypeVar("Engine", DMAEngine, AsyncComputeEngine)
+
+
+def _index_by_id(engines: List[Engine], kind: str) -> List[Engine]:
+    """Return engines ordered so that engines[i].id == i
+
+    Raises:
+        ValueError: If the ids are not exactly 0..len(engines)-1
+    """
+    by_id = sorted(engines, key=lambda engine: engine.id)
+    ids = [engine.id for engine in by_id]
+    if ids != list(range(len(engines))):
+        raise ValueError(
+            f"{kind} engine ids must be 0..{len(engines) - 1} with no repeats, "
+            f"got {ids}"
+        )
+    return by_id
+
 
 class CommandProcessor:
     """Handles commands from the CPU for GPU processing
@@ -16,7 +35,8 @@ class CommandProcessor:
         dma_engine: DMA engine for memory transfers
         async_compute_engine: Async compute engine for kernel execution
         available_dma: Queue of available DMA engines
-        available_ace: Queue of available ACE units
+        available_ace: Queue of available ACE units (engines re-queue
+            themselves through their on_available callback)
         command_queue: Queue of commands to be processed
     """
 
@@ -25,41 +45,55 @@ class CommandProcessor:
         dma_engines: List[DMAEngine],
         async_compute_engines: List[AsyncComputeEngine],
     ):
-        self.dma_engines = {
-            dma_engine.id: dma_engine for dma_engine in dma_engines
-        }
-
-        self.async_compute_engines = {
-            async_compute_engine.id: async_compute_engine
-            for async_compute_engine in async_compute_engines
-        }
+        # Engine ids run 0..n-1, so a list indexed by id replaces a dict lookup
+        self.dma_engines: List[DMAEngine] = _index_by_id(dma_engines, "DMA")
+        self.async_compute_engines: List[AsyncComputeEngine] = _index_by_id(
+            async_compute_engines, "ACE"
+        )
 
         self.available_dma: deque[int] = deque(
             dma_engine.id for dma_engine in dma_engines)
         self.available_ace: deque[int] = deque(
             async_compute_engine.id for async_compute_engine in async_compute_engines
         )
+        self._dma_in_queue: set[int] = set(self.available_dma)
+        self._ace_in_queue: set[int] = set(self.available_ace)
+
+        for dma_engine in dma_engines:
+            dma_engine.on_available = self._release_dma
+        for async_compute_engine in async_compute_engines:
+            async_compute_engine.on_available = self._release_ace
+
+        self.command_queue: deque[Kernel] = deque()
 
-        self.command_queue: List[Kernel] = []
+        # Indexed by CommandType value
+        self._dispatch = (self._handle_memory_copy, self._handle_kernel_launch)
 
     def enqueue_command(self, kernel: Kernel):
         self.command_queue.append(kernel)
 
+    def dequeue_command(self) -> Kernel:
+        return self.command_queue.popleft()
+
     def find_available_dma(self) -> int:
-        return self.available_dma.popleft()
+        dma_engine_id = self.available_dma.popleft()
+        self._dma_in_queue.discard(dma_engine_id)
+        return dma_engine_id
 
     def find_available_ace(self) -> int:
-        return self.available_ace.popleft()
+        ace_engine_id = self.available_ace.popleft()
+        self._ace_in_queue.discard(ace_engine_id)
+        return ace_engine_id
 
-    def add_available_dma(self):
-        for dma_engine in self.dma_engines.values():
-            if dma_engine.available:
-                self.available_dma.append(dma_engine.id)
+    def _release_dma(self, dma_engine_id: int):
+        if dma_engine_id not in self._dma_in_queue:
+            self._dma_in_queue.add(dma_engine_id)
+            self.available_dma.append(dma_engine_id)
 
-    def add_available_ace(self):
-        for async_compute_engine in self.async_compute_engines.values():
-            if async_compute_engine.available:
-                self.available_ace.append(async_compute_engine.id)
+    def _release_ace(self, ace_engine_id: int):
+        if ace_engine_id not in self._ace_in_queue:
+            self._ace_in_queue.add(ace_engine_id)
+            self.available_ace.append(ace_engine_id)
 
     def process_command(self, kernel: Kernel):
         """Process a command received from the CPU
@@ -70,19 +104,22 @@ class CommandProcessor:
         Raises:
             ValueError: If command type is unknown
         """
-        command_type = kernel.type
-        if command_type == "memory_copy":
-            dma_engine_id = self.find_available_dma()
-            self.demand_to_dma_engine(kernel, dma_engine_id)
-        elif command_type == "kernel_launch":
-            ace_engine_id = self.find_available_ace()
-            self.demand_to_async_compute_engine(kernel, ace_engine_id)
-        else:
-            raise ValueError("Unknown command type")
+        # Validate before indexing: -1 or True would otherwise pick a handler
+        if not isinstance(kernel.type, CommandType):
+            raise ValueError(f"Unknown command type {kernel.type!r}")
+        self._dispatch[kernel.type](kernel)
+
+    def _handle_memory_copy(self, kernel: Kernel):
+        dma_engine_id = self.find_available_dma()
+        self.demand_to_dma_engine(kernel, dma_engine_id)
+
+    def _handle_kernel_launch(self, kernel: Kernel):
+        ace_engine_id = self.find_available_ace()
+        self.demand_to_async_compute_engine(kernel, ace_engine_id)
 
     def demand_to_dma_engine(self, kernel: Kernel, dma_engine_id: int):
         """Demand to a DMA engine"""
-        self.dma_engines[dma_engine_id].demand(kernel)
+        self.dma_engines[dma_engine_id].receive_kernel(kernel)
 
     def demand_to_async_compute_engine(self, kernel: Kernel, ace_engine_id: int):
         """Demand to an ACE unit"""
@@ -1,6 +1,6 @@
 from ..mem.dram import DRAMController
 from tinygpusim.cpu.cpu_mem import CPUMemory
-from typing import Optional
+from typing import Callable, Optional
 from ..computation_entities import Kernel
 
 
@@ -12,13 +12,25 @@ class DMAEngine:
 
     Attributes:
         channels: Active DMA channels.
+        on_available: Called with the engine id when it becomes available.
     """
 
+    __slots__ = (
+        "id",
+        "cpu",
+        "dram",
+        "burst_size",
+        "kernel",
+        "_available",
+        "on_available",
+    )
+
     def __init__(
         self,
         id: int,
         dram: DRAMController,
         cpu: CPUMemory,
+        burst_size: int = 64 * 1024,
     ):
         """
         initializes the DMA engine.
@@ -26,12 +38,19 @@ class DMAEngine:
         Input:
             dram (DRAMController): Memory controller.
             num_channels (int): Number of DMA channels.
+            burst_size (int): Bytes moved per copy step. Defaults to 64KB.
+        Error:
+            Raises ValueError if burst_size is not positive.
         """
+        if burst_size <= 0:
+            raise ValueError(f"burst_size must be positive, got {burst_size}")
         self.id = id
         self.cpu: CPUMemory = cpu
         self.dram: DRAMController = dram
+        self.burst_size = burst_size
         self.kernel: Optional[Kernel] = None
         self._available = True
+        self.on_available: Optional[Callable[[int], None]] = None
 
     @property
     def available(self) -> bool:
@@ -42,16 +61,27 @@ class DMAEngine:
         self.kernel = kernel
         self.update_available()
 
+    def finish_kernel(self):
+        """Release the current kernel once its transfer is done"""
+        self.kernel = None
+        self.update_available()
+
     def update_available(self):
         """Update the availability of the DMA engine"""
-        self._available = True
+        was_available = self._available
+        self._available = self.kernel is None
+        if self._available and not was_available and self.on_available is not None:
+            self.on_available(self.id)
 
     def copy_from_cpu_to_dram(self, src_addr, dst_addr, size):
         """Copies data from CPU memory to DRAM.
-        """
-        data = self.cpu.read(src_addr, size)
-        self.dram.write(dst_addr, data)
-
 
-if __name__ == "__main__":
-    pass
+        Both ranges are checked once up front, then the bytes are streamed
+        in burst_size pieces between views of the two buffers, so no
+        intermediate buffer is allocated whatever the transfer size.
+        """
+        src = self.cpu.read(src_addr, size)
+        self.dram.check_range(dst_addr, size)
+        burst = self.burst_size
+        for offset in range(0, size, burst):
+            self.dram.store_unchecked(dst_addr + offset, src[offset : offset + burst])
@@ -1,3 +1,6 @@
+import mmap
+
+
 class DRAMController:
     """
     capacity in bytes
@@ -13,32 +16,43 @@ class DRAMController:
             None
         Data structure changed:
             self.capacity (int): The capacity of the DRAM.
-            self.storage (bytearray): The DRAM storage.
+            self.storage (mmap.mmap): The DRAM storage. An anonymous mapping
+                is zero-filled lazily by the OS, so untouched capacity costs
+                no resident memory.
         Error:
-            None
+            Raises ValueError if capacity is not positive; an anonymous
+            mapping cannot be empty.
         """
+        if capacity <= 0:
+            raise ValueError(f"DRAM capacity must be positive, got {capacity}")
         self.capacity = capacity
-        self.storage: bytearray = bytearray(capacity)
+        self.storage: mmap.mmap = mmap.mmap(-1, capacity)
+        self._view = memoryview(self.storage)
         self.address_limit = capacity - 1
 
-    def check_address(func):
-        def wrapper(self, address, *args, **kwargs):
-            if not 0 <= address <= self.address_limit:
-                raise ValueError(
-                    f"Address {address} out of range (0-{self.address_limit})"
-                )
-            return func(self, address, *args, **kwargs)
-
-        return wrapper
+    def check_range(self, address, size):
+        """Raise ValueError unless [address, address + size) fits in DRAM"""
+        if address < 0 or address + size > self.capacity:
+            raise ValueError(
+                f"Address {address} out of range (0-{self.address_limit})"
+            )
 
-    @check_address
     def load(self, address, size):
-        """Read from memory"""
-        return self.storage[address : address + size]
+        """Read from memory as a zero-copy memoryview"""
+        self.check_range(address, size)
+        return self._view[address : address + size]
 
-    @check_address
     def store(self, address, data):
         """Write to memory"""
+        self.check_range(address, len(data))
+        self.storage[address : address + len(data)] = data
+
+    def load_unchecked(self, address, size):
+        """Read from memory; the caller has already validated the range"""
+        return self._view[address : address + size]
+
+    def store_unchecked(self, address, data):
+        """Write to memory; the caller has already validated the range"""
         self.storage[address : address + len(data)] = data
 
 
@@ -51,6 +65,6 @@ if __name__ == "__main__":
         dram.store(address, data)
         loaded_data = dram.load(address, len(data))
         print(f"Stored data: {data}")
-        print(f"Loaded data: {loaded_data}")
+        print(f"Loaded data: {bytes(loaded_data)}")
     except ValueError as e:
         print(f"Error: {e}")
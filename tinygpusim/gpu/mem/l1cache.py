@@ -1,33 +1,49 @@
 class L1Cache:
     """32KB L1 data cache with LRU policy
     Args:
+        size (int): Cache capacity in bytes
         line_size (int): Cache line size in bytes
         ways (int): Associativity
     Attributes:
-        tags: Cache tag storage
-        lru_counter: Replacement tracking
+        num_sets: Number of sets, size // (line_size * ways)
+        line_shift: log2(line_size), turns an address into a line number
+        set_mask: num_sets - 1, turns a line number into a set index
+        tags: Per-set tag lists, most recently used first
     """
 
-    def __init__(self, line_size=64, ways=4):
+    def __init__(self, size=32 * 1024, line_size=64, ways=4):
+        self.size = size
         self.line_size = line_size
         self.ways = ways
-        self.tags = {}
-        self.lru_counter = 0
+        self.num_sets = size // (line_size * ways)
+        for name, value in (("line_size", line_size), ("num_sets", self.num_sets)):
+            if value <= 0 or value & (value - 1):
+                raise ValueError(f"{name} must be a power of two, got {value}")
+        self.line_shift = line_size.bit_length() - 1
+        self.set_mask = self.num_sets - 1
+        self.tags = [[] for _ in range(self.num_sets)]
 
     def access(self, address, is_write):
         """Handle cache access
+        Misses allocate the line (write-allocate), evicting the least
+        recently used way when the set is full.
         Args:
             address (int): Memory address
             is_write (bool): Write operation flag
         Returns:
             bool: True if hit
         """
-        tag = address // self.line_size
-        set_idx = tag % self.ways
+        tag = address >> self.line_shift
+        lines = self.tags[tag & self.set_mask]
 
-        if tag in self.tags.get(set_idx, []):
+        if tag in lines:
             # Hit
-            self.lru_counter += 1
+            if lines[0] != tag:
+                lines.remove(tag)
+                lines.insert(0, tag)
             return True
         # Miss handling
+        if len(lines) == self.ways:
+            lines.pop()
+        lines.insert(0, tag)
         return False
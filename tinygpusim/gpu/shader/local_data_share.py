@@ -1,5 +1,27 @@
+from typing import Optional
+
+LDS_SIZE = 64 * 1024
+
+
 class LocalDataShare:
-    """Local data share for a shader engine"""
+    """Local data share for a shader engine
+    Args:
+        storage (memoryview): Buffer backing the LDS, e.g. a slice of a pool
+            shared by several arrays; a private buffer is allocated if omitted
+        size (int): Capacity in bytes. Defaults to LDS_SIZE without storage,
+            and to len(storage) with it
+    Raises:
+        ValueError: If both are given and size != len(storage)
+    """
 
-    def __init__(self):
-        self.local_data = {}
+    def __init__(
+        self, storage: Optional[memoryview] = None, size: Optional[int] = None
+    ):
+        if storage is None:
+            storage = memoryview(bytearray(LDS_SIZE if size is None else size))
+        elif size is not None and size != len(storage):
+            raise ValueError(
+                f"size {size} does not match the {len(storage)}-byte storage"
+            )
+        self.storage = storage
+        self.size = len(storage)
@@ -1,37 +1,106 @@
-from typing import List, Optional
-from dataclasses import field
+import heapq
+from array import array
+from itertools import chain
+from typing import List, Optional, Tuple
 from ..computation_entities import Workgroup, Wavefront
-from .local_data_share import LocalDataShare
+from .local_data_share import LDS_SIZE, LocalDataShare
+
+SGPR_COUNT = 256
+SIMD_COUNT = 4
+VGPR_COUNT = 256
+WAVEFRONT_WIDTH = 64
+WAVEFRONTS_PER_WORKGROUP = 4
 
 
 class ComputeUnit:
     """SIMD processing unit with register file
     Args:
-        simd_width (int): Number of parallel ALUs
+        local_data_share (LocalDataShare): LDS shared with the array's CUs
+        max_wavefronts (int): Number of wavefront slots
     Attributes:
-        reg_file: Vector register storage
-        cycle_count: Total executed cycles
+        waverfront_slots: Wavefronts resident on this CU
+        scalar_registers: SGPR file, SGPR_COUNT packed uint32 values
+        vector_registers: VGPR file shared by the CU's SIMD_COUNT SIMDs,
+            SIMD_COUNT * VGPR_COUNT registers of WAVEFRONT_WIDTH uint32
+            lanes; lane l of register r is at r * WAVEFRONT_WIDTH + l
+        vgprs_per_wavefront: Registers each wavefront slot is given out of
+            vector_registers
     """
 
-    def __init__(self, local_data_share: LocalDataShare):
-        self.waverfront_slots = field(default_factory=list)
-        self.scalar_registers = field(default_factory=list)
-        self.vector_registers = field(default_factory=list)
+    __slots__ = (
+        "max_wavefronts",
+        "waverfront_slots",
+        "scalar_registers",
+        "vector_registers",
+        "vgprs_per_wavefront",
+        "local_data_share",
+    )
+
+    def __init__(self, local_data_share: LocalDataShare, max_wavefronts: int = 40):
+        self.max_wavefronts = max_wavefronts
+        self.waverfront_slots: List[Wavefront] = []
+        self.scalar_registers = array("I", [0]) * SGPR_COUNT
+        self.vgprs_per_wavefront = SIMD_COUNT * VGPR_COUNT // max_wavefronts
+        if self.vgprs_per_wavefront == 0:
+            raise ValueError(
+                f"max_wavefronts must be at most {SIMD_COUNT * VGPR_COUNT}, "
+                f"got {max_wavefronts}"
+            )
+        self.vector_registers = array("I", [0]) * (
+            SIMD_COUNT * VGPR_COUNT * WAVEFRONT_WIDTH
+        )
         self.local_data_share = local_data_share
 
+    @property
+    def free_wavefront_slots(self) -> int:
+        return self.max_wavefronts - len(self.waverfront_slots)
+
+    def wavefront_vgprs(self, slot: int) -> memoryview:
+        """Return the VGPRs of wavefront slot as a zero-copy view"""
+        if not 0 <= slot < self.max_wavefronts:
+            raise ValueError(f"Slot {slot} out of range (0-{self.max_wavefronts - 1})")
+        span = self.vgprs_per_wavefront * WAVEFRONT_WIDTH
+        return memoryview(self.vector_registers)[slot * span : (slot + 1) * span]
+
+    def _allocate_wavefronts(self, wavefronts: List[Wavefront]):
+        """Place a batch of wavefronts on this CU in one step
+
+        Only ShaderEngine.allocate_wavefronts should call this, so that the
+        engine's load tracking stays in sync with the CU.
+        """
+        if len(wavefronts) > self.free_wavefront_slots:
+            raise ValueError("Not enough free wavefront slots")
+        self.waverfront_slots.extend(wavefronts)
+
 
 class ShaderArray:
     """Array of compute units in a shader engine
     Args:
         cu_count (int): Number of compute units in this array
+        local_data_share (LocalDataShare): LDS shared by the array's CUs;
+            a private one is created if omitted
     Attributes:
-        compute_units: Ordered collection of compute units (List for sequential access)
+        compute_units: Fixed, ordered collection of compute units
     """
 
-    def __init__(self, cu_count=4):
-        data_share = LocalDataShare()
-        self.compute_units: List[ComputeUnit] = [
-            ComputeUnit(local_data_share=data_share) for _ in range(cu_count)
+    __slots__ = ("compute_units",)
+
+    def __init__(self, cu_count=4, local_data_share: Optional[LocalDataShare] = None):
+        if local_data_share is None:
+            local_data_share = LocalDataShare()
+        self.compute_units: Tuple[ComputeUnit, ...] = tuple(
+            ComputeUnit(local_data_share=local_data_share) for _ in range(cu_count)
+        )
+
+    @classmethod
+    def create_pool(
+        cls, num_arrays: int, cu_count: int = 4, lds_bytes: int = LDS_SIZE
+    ) -> List["ShaderArray"]:
+        """Create shader arrays whose LDS buffers are slices of one allocation"""
+        pool = memoryview(bytearray(num_arrays * lds_bytes))
+        return [
+            cls(cu_count, LocalDataShare(pool[offset : offset + lds_bytes]))
+            for offset in range(0, num_arrays * lds_bytes, lds_bytes)
         ]
 
 
@@ -41,29 +110,113 @@ class ShaderEngine:
         pipe_depth (int): Maximum in-flight instructions
     Attributes:
         input_pipe: Input pipeline for shader instructions
+        cu_flat: Every compute unit across the shader arrays, built once
+        cu_heap: Min-heap of (wavefront load, index into cu_flat), rebuilt
+            once stale entries outnumber live ones
     """
 
+    __slots__ = (
+        "shader_arrays",
+        "cu_flat",
+        "_cu_index",
+        "_cu_loads",
+        "cu_heap",
+    )
+
     def __init__(
         self,
         shader_arrays: List[ShaderArray],
     ):
-        self.shader_arrays: List[ShaderArray] = shader_arrays
+        self.shader_arrays: Tuple[ShaderArray, ...] = tuple(shader_arrays)
+        self.cu_flat: Tuple[ComputeUnit, ...] = tuple(
+            chain.from_iterable(
+                shader_array.compute_units for shader_array in self.shader_arrays
+            )
+        )
+        # least_loaded_compute_unit relies on every CU having the same slot count
+        slot_counts = {cu.max_wavefronts for cu in self.cu_flat}
+        if len(slot_counts) > 1:
+            raise ValueError(
+                f"All compute units must share max_wavefronts, got {sorted(slot_counts)}"
+            )
+        self._cu_index = {cu: idx for idx, cu in enumerate(self.cu_flat)}
+        # Load recorded in each CU's live heap entry; entries whose load no
+        # longer matches were superseded and are dropped when they surface.
+        self._cu_loads = [len(cu.waverfront_slots) for cu in self.cu_flat]
+        self.cu_heap = [(load, idx) for idx, load in enumerate(self._cu_loads)]
+        heapq.heapify(self.cu_heap)
+
+    def least_loaded_compute_unit(self, wavefront_count: int) -> Optional[ComputeUnit]:
+        """Return the CU with the fewest wavefronts if it has room for
+        wavefront_count more, else None
+        """
+        heap = self.cu_heap
+        while heap:
+            load, idx = heap[0]
+            if load != self._cu_loads[idx]:
+                heapq.heappop(heap)
+                continue
+            compute_unit = self.cu_flat[idx]
+            # CUs share one slot count (checked in __init__), so if the least
+            # loaded CU lacks room, every CU does
+            if compute_unit.free_wavefront_slots >= wavefront_count:
+                return compute_unit
+            return None
+        return None
+
+    def allocate_wavefronts(self, compute_unit: ComputeUnit, wavefronts: List[Wavefront]):
+        """Place wavefronts on a CU and record its new load"""
+        compute_unit._allocate_wavefronts(wavefronts)
+        self._update_load(compute_unit)
+
+    def retire_wavefront(self, compute_unit: ComputeUnit, wavefront: Wavefront):
+        """Remove a finished wavefront from its CU and record the new load"""
+        compute_unit.waverfront_slots.remove(wavefront)
+        self._update_load(compute_unit)
+
+    def _update_load(self, compute_unit: ComputeUnit):
+        idx = self._cu_index[compute_unit]
+        load = len(compute_unit.waverfront_slots)
+        self._cu_loads[idx] = load
+        if len(self.cu_heap) >= 2 * len(self.cu_flat):
+            # Compact: keep only the live entry of each CU
+            self.cu_heap = [(load, idx) for idx, load in enumerate(self._cu_loads)]
+            heapq.heapify(self.cu_heap)
+        else:
+            heapq.heappush(self.cu_heap, (load, idx))
 
 
 class ShaderPipeInput:
     """Front-end for shader instruction processing"""
 
+    __slots__ = ("shader_engine", "workgroup", "wavefronts")
+
     def __init__(self, shader_engine: ShaderEngine):
         self.shader_engine = shader_engine
         self.workgroup: Optional[Workgroup] = None
+        self.wavefronts: List[Wavefront] = []
 
     def get_workgroup(self) -> Optional[Workgroup]:
         return self.workgroup
 
-    def break_workgroup_into_wavefronts(self):
-        """Break the workgroup into wavefronts"""
-        wavefront_per_workgroup = 4
-        if self.workgroup is not None:
-            self.wavefronts = [
-                Wavefront(self.workgroup) for _ in range(wavefront_per_workgroup)
-            ]
+    def break_workgroup_into_wavefronts(self) -> Optional[ComputeUnit]:
+        """Break the workgroup into wavefronts and place them on a CU
+        Returns:
+            ComputeUnit: The CU that received the wavefronts, or None if
+            there is no workgroup or no CU has enough free slots
+        """
+        if self.workgroup is None:
+            return None
+
+        target_cu = self.shader_engine.least_loaded_compute_unit(
+            WAVEFRONTS_PER_WORKGROUP
+        )
+        if target_cu is None:
+            return None
+
+        self.wavefronts = [
+            Wavefront(kernel=self.workgroup.kernel, workgroup=self.workgroup)
+            for _ in range(WAVEFRONTS_PER_WORKGROUP)
+        ]
+        self.shader_engine.allocate_wavefronts(target_cu, self.wavefronts)
+        return target_cu
@@ -1,12 +1,90 @@
+from collections import deque
+from itertools import accumulate
+from math import ceil
+from typing import Iterable
+
+
 class PCIe:
-    def __init__(self, speed: int = 16):
+    """Host-to-GPU PCIe link
+    Args:
+        speed (int): Link bandwidth in GB/s (16 is roughly PCIe 3.0 x16)
+        clock_ghz (float): Simulation clock, used to turn time into cycles
+    Attributes:
+        busy_until: Cycle at which the link finishes its queued transfers
+        inflight: Pending transfers as (finish_cycle, dst_addr, size),
+            in finish order
+    """
+
+    __slots__ = ("speed", "bytes_per_cycle", "busy_until", "inflight")
+
+    def __init__(self, speed: int = 16, clock_ghz: float = 1.0):
         self.speed = speed
+        self.bytes_per_cycle = speed / clock_ghz
+        self.busy_until = 0
+        self.inflight: deque[tuple[int, int, int]] = deque()
 
     def transfer(
         self,
-        data: bytes,
+        data: memoryview,
         dst_addr: int,
         size: int,
-    ) -> None:
-        """Simulates a data transfer over PCIe."""
-        return data, dst_addr, size
+        now: int = 0,
+    ) -> int:
+        """Simulates a data transfer over PCIe.
+
+        Only timing is modelled: the payload is neither copied nor kept, so
+        the cost is the same for any size. Transfers share the link and
+        finish in the order they were issued.
+
+        Returns:
+            int: Cycle at which the transfer completes.
+        """
+        start = max(now, self.busy_until)
+        finish_cycle = start + ceil(size / self.bytes_per_cycle)
+        self.busy_until = finish_cycle
+        self.inflight.append((finish_cycle, dst_addr, size))
+        return finish_cycle
+
+    def transfer_batch(
+        self,
+        sizes: Iterable[int],
+        dst_addrs: Iterable[int],
+        now: int = 0,
+    ) -> list[int]:
+        """Simulates several back-to-back transfers over PCIe.
+
+        Equivalent to calling transfer for each (size, dst_addr) pair in
+        order, but completion cycles come from one running sum of the
+        transfer durations.
+
+        Returns:
+            list[int]: Completion cycle of each transfer.
+        Raises:
+            ValueError: If sizes and dst_addrs differ in length
+        """
+        # sizes is read twice, so materialize it in case it is an iterator
+        sizes = list(sizes)
+        dst_addrs = list(dst_addrs)
+        if len(sizes) != len(dst_addrs):
+            raise ValueError(
+                f"Got {len(sizes)} sizes but {len(dst_addrs)} destination addresses"
+            )
+        bytes_per_cycle = self.bytes_per_cycle
+        finish_cycles = list(
+            accumulate(
+                (ceil(size / bytes_per_cycle) for size in sizes),
+                initial=max(now, self.busy_until),
+            )
+        )
+        del finish_cycles[0]
+        if finish_cycles:
+            self.busy_until = finish_cycles[-1]
+        self.inflight.extend(zip(finish_cycles, dst_addrs, sizes))
+        return finish_cycles
+
+    def retire(self, now: int) -> list[tuple[int, int, int]]:
+        """Removes and returns the transfers completed by cycle now."""
+        done = []
+        while self.inflight and self.inflight[0][0] <= now:
+            done.append(self.inflight.popleft())
+        return done
@@ -7,13 +7,23 @@
 # 4. Memory system update -> Dedicated memory stage
 # 5. Visualization        -> Debugging stage not present in real hardware
 
+import io
+import sys
+from collections import deque
 
-def run_gpu_simulation(instruction_stream: list):
+# Pipeline stages in order; index i of the pipeline deque holds stage i.
+PIPELINE_STAGES = ("fetch", "decode", "execute", "memory", "write_back")
+FETCH = 0
+
+
+def run_gpu_simulation(instruction_stream: list, verbose: bool = False) -> int:
     """
     Input:
         instruction_stream (list): A list of instructions to simulate.
+        verbose (bool): Emit a per-cycle trace. The trace is buffered in
+            memory and written to stdout once the simulation finishes.
     Output:
-        None
+        int: Number of cycles simulated.
     Data structure changed:
         This function updates internal scheduler states,
         pipeline stages, and memory status.
@@ -24,32 +34,51 @@ def run_gpu_simulation(instruction_stream: list):
     warp_scheduler = initialize_scheduler()
     pipeline_stages = initialize_pipeline()
     cycle_count = 0
+    in_flight = 0
+
+    # Add initial instructions to scheduler. The pipeline carries small
+    # integer ids; text is only looked up again when a trace is printed.
+    # The id table belongs to this run, so nothing accumulates across runs.
+    instr_ids: dict[str, int] = {}
+    pending = warp_scheduler["pending"] = deque(
+        instr_ids.setdefault(instr, len(instr_ids)) for instr in instruction_stream
+    )
+    warp_scheduler["instr_names"] = list(instr_ids)
+    completed = warp_scheduler["completed"] = []
 
-    # Add initial instructions to scheduler
-    warp_scheduler["pending"] = instruction_stream.copy()
-    warp_scheduler["completed"] = []
+    log = io.StringIO() if verbose else None
+
+    # Local bindings keep the per-cycle calls off the global lookup path
+    _dispatch = dispatch_warps
+    _execute = execute_pipeline
+    _update_memory = update_memory_system
 
     # Run until all instructions are processed
-    while not all_instructions_complete(instruction_stream):
-        print(f"\n=== Cycle {cycle_count} ===")
+    while pending or in_flight:
+        if log is not None:
+            print(f"\n=== Cycle {cycle_count} ===", file=log)
 
         # Dispatch warps or threads
-        dispatch_warps(warp_scheduler, pipeline_stages)
+        in_flight += _dispatch(warp_scheduler, pipeline_stages, log)
 
         # Simulate pipeline progression
-        execute_pipeline(pipeline_stages)
+        retired = _execute(pipeline_stages)
+        completed.extend(retired)
+        in_flight -= len(retired)
 
         # Update memory states for any outstanding requests
-        update_memory_system()
+        _update_memory()
 
         # Print current pipeline state
-        print_pipeline_state(pipeline_stages, warp_scheduler)
+        if log is not None:
+            print_pipeline_state(pipeline_stages, warp_scheduler, log)
 
         cycle_count += 1
-        if cycle_count > 10:  # Safety limit for testing
-            break
 
-    print(f"\nSimulation complete in {cycle_count} cycles.")
+    if log is not None:
+        print(f"\nSimulation complete in {cycle_count} cycles.", file=log)
+        sys.stdout.write(log.getvalue())
+    return cycle_count
 
 
 def initialize_scheduler():
@@ -72,74 +101,58 @@ def initialize_pipeline():
     Input:
         None
     Output:
-        Returns an initialized pipeline object or dict.
+        Returns a deque with one instruction list per stage, ordered as
+        PIPELINE_STAGES. Its maxlen is the stage count, so pushing a new
+        fetch slot drops the write_back slot.
     Data structure changed:
         None, this function only creates and returns a new object.
     Error:
         None
     """
-    return {
-        "fetch": [],
-        "decode": [],
-        "execute": [],
-        "memory": [],
-        "write_back": [],
-    }
-
-
-def all_instructions_complete(instruction_stream):
-    """
-    Input:
-        instruction_stream (list): The instructions being simulated.
-    Output:
-        bool: True if all instructions have finished executing,
-        otherwise False.
-    Data structure changed:
-        None, this function only checks states.
-    Error:
-        None
-    """
-    return len(instruction_stream) == 0
+    return deque(([] for _ in PIPELINE_STAGES), maxlen=len(PIPELINE_STAGES))
 
 
-def dispatch_warps(scheduler, pipeline):
+def dispatch_warps(scheduler, pipeline, log=None):
     """
     Input:
         scheduler (dict): Current warp scheduler state.
-        pipeline (dict): Pipeline stages.
+        pipeline (deque): Pipeline stages.
+        log (TextIO): Optional stream for trace messages.
     Output:
-        None
+        int: Number of instructions dispatched this cycle.
     Data structure changed:
         scheduler or pipeline data structure is updated with new dispatches.
     Error:
         None
     """
     if (
-        scheduler["pending"] and len(pipeline["fetch"]) < 2
+        scheduler["pending"] and len(pipeline[FETCH]) < 2
     ):  # Max 2 instructions in fetch
-        instr = scheduler["pending"].pop(0)
-        pipeline["fetch"].append(instr)
-        print(f"Dispatched instruction: {instr}")
+        instr = scheduler["pending"].popleft()
+        pipeline[FETCH].append(instr)
+        if log is not None:
+            instr_text = scheduler["instr_names"][instr]
+            print(f"Dispatched instruction: {instr_text}", file=log)
+        return 1
+    return 0
 
 
 def execute_pipeline(pipeline):
     """
     Input:
-        pipeline (dict): Pipeline stages with instructions in each.
+        pipeline (deque): Pipeline stages with instructions in each.
     Output:
-        None
+        list: Instructions retired from the write_back stage.
     Data structure changed:
         The contents of pipeline (moving instructions from one stage
         to the next).
     Error:
         None
     """
-    # Simple shift for demonstration
-    pipeline["write_back"] = pipeline["memory"]
-    pipeline["memory"] = pipeline["execute"]
-    pipeline["execute"] = pipeline["decode"]
-    pipeline["decode"] = pipeline["fetch"]
-    pipeline["fetch"] = []
+    # Every stage advances by one; the bounded deque drops write_back
+    retired = pipeline[-1]
+    pipeline.appendleft([])
+    return retired
 
 
 def update_memory_system():
@@ -157,11 +170,12 @@ def update_memory_system():
     pass
 
 
-def print_pipeline_state(pipeline, scheduler):
+def print_pipeline_state(pipeline, scheduler, out=None):
     """
     Input:
-        pipeline (dict): Pipeline stages
+        pipeline (deque): Pipeline stages
         scheduler (dict): Scheduler state
+        out (TextIO): Stream to write to; defaults to stdout
     Output:
         None
     Data structure changed:
@@ -169,10 +183,16 @@ def print_pipeline_state(pipeline, scheduler):
     Error:
         None
     """
-    print("\nPipeline State:")
-    for stage, instructions in pipeline.items():
-        print(f"{stage:10}: {instructions}")
-    print(f"\nPending instructions: {len(scheduler['pending'])}")
+    instr_names = scheduler["instr_names"]
+    stage_lines = "\n".join(
+        f"{stage:10}: {[instr_names[instr] for instr in instructions]}"
+        for stage, instructions in zip(PIPELINE_STAGES, pipeline)
+    )
+    print(
+        f"\nPipeline State:\n{stage_lines}\n"
+        f"\nPending instructions: {len(scheduler['pending'])}",
+        file=out,
+    )
 
 
 # Add this at the bottom to test the simulation
@@ -184,4 +204,4 @@ if __name__ == "__main__":
         "LOAD R6, [R7]",
         "STORE [R8], R9",
     ]
-    run_gpu_simulation(test_instructions)
+    run_gpu_simulation(test_instructions, verbose=True)